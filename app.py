@@ -4,7 +4,7 @@ def main():
     archivo = "datos/sri_ventas_2024.csv"
     analizador = Analizador(archivo)
     print("Ventas totales por provincia:")
-    resumen = analizador.ventas_totales_por_provincia()
+    resumen = analizador.ventas_totales_por_provincia(copiar=False)
     for prov, total in resumen.items():
         print(f"\t{prov}: ${total:.2f}")
     print("\nCompras para una provincia")
@@ -1,76 +1,220 @@
+from array import array
 import csv
-from collections import defaultdict
+from functools import cached_property
+from operator import itemgetter
+from types import MappingProxyType, SimpleNamespace
 import os
 
 class Analizador:
     # Definimos el separador y la lista de campos que necesitan limpieza numérica
     CAMPOS_NUMERICOS_CLAVE = ["TOTAL_VENTAS", "EXPORTACIONES", "IMPORTACIONES", "VENTAS_NETAS_TARIFA_0"] 
+    # Tamaño del búfer de lectura del CSV (1 MiB)
+    TAMANO_BUFFER_LECTURA = 1 << 20
 
     def __init__(self, ruta_csv, separador='|'):
         # Usamos '|' como separador según tu código original
         self.ruta_csv = ruta_csv
         self.separador = separador
         # Leemos el archivo CSV y guardamos los datos ya limpios en memoria
-        self.datos = self.leer_csv()
+        self.columnas, self.etiquetas = self.leer_csv()
 
     def _limpiar_valor_numerico(self, valor):
         """Convierte una cadena a flotante, asegurando que el resultado no sea negativo (>= 0.0)."""
         if valor is None:
             return 0.0
         try:
-            # Reemplazamos comas por puntos si el CSV usa formato europeo (opcional)
-            valor = str(valor).replace(',', '.') 
+            # Camino rápido: la mayoría de valores ya usan punto decimal
             num = float(valor)
-            # Requisito de la práctica: asegurar que el valor calculado NO sea negativo.
-            return max(0.0, num) 
         except (ValueError, TypeError):
-            return 0.0
+            try:
+                # Reemplazamos comas por puntos si el CSV usa formato europeo (opcional)
+                num = float(str(valor).replace(',', '.'))
+            except (ValueError, TypeError):
+                return 0.0
+        # Requisito de la práctica: asegurar que el valor calculado NO sea negativo.
+        # Expresión condicional en lugar de max(): evita una llamada a función por valor
+        # (también convierte NaN en 0.0, igual que max).
+        return num if num > 0.0 else 0.0
+
+    def _columnas_vacias(self):
+        """Crea la estructura por columnas que guarda los datos limpios.
+
+        PROVINCIA y MES se guardan como códigos enteros (array('i')) que indexan la lista
+        de nombres en etiquetas; los campos numéricos son array('d'), que guarda los
+        float de forma contigua sin crear un objeto por valor.
+        """
+        columnas = {"PROVINCIA": array('i'), "MES": array('i')}
+        for campo in self.CAMPOS_NUMERICOS_CLAVE:
+            columnas[campo] = array('d')
+        etiquetas = {"PROVINCIA": [], "MES": []}
+        return columnas, etiquetas
+
+    def _codigo_etiqueta(self, nombres, indice, nombre):
+        """Devuelve el código (posición en nombres) de una etiqueta, registrándola si es nueva.
+
+        indice relaciona cada nombre ya registrado con su código, así la búsqueda no
+        recorre la lista de nombres.
+        """
+        codigo = indice.get(nombre)
+        if codigo is None:
+            codigo = indice[nombre] = len(nombres)
+            nombres.append(nombre)
+        return codigo
 
     def leer_csv(self):
-        """Lee el archivo CSV, limpia los valores numéricos de campos clave y devuelve una lista de filas."""
-        datos_limpios = []
+        """Lee el archivo CSV, limpia los valores numéricos de campos clave y devuelve (columnas, etiquetas)."""
+        # Guardamos los datos por columnas en lugar de un diccionario por fila: se evita
+        # crear un objeto por fila y las sumas recorren columnas contiguas.
+        columnas, etiquetas = vacias = self._columnas_vacias()
         
         if not os.path.exists(self.ruta_csv):
-            print(f"Advertencia: Archivo no encontrado en {self.ruta_csv}. Retornando lista vacía.")
-            return datos_limpios
+            print(f"Advertencia: Archivo no encontrado en {self.ruta_csv}. Retornando columnas vacías.")
+            return vacias
             
         try:
-            with open(self.ruta_csv, "r", encoding="utf-8") as archivo:
+            # Búfer de 1 MiB (el predeterminado es de 8 KiB): menos llamadas read() al recorrer el archivo
+            with open(self.ruta_csv, "r", encoding="utf-8", buffering=self.TAMANO_BUFFER_LECTURA) as archivo:
                 # Usar el separador definido
-                lector = csv.DictReader(archivo, delimiter=self.separador) 
+                # csv.reader devuelve listas: no se construye un diccionario por fila y cada
+                # campo se lee por su posición, calculada una sola vez a partir del encabezado.
+                lector = csv.reader(archivo, delimiter=self.separador)
+                encabezado = next(lector, None)
+                if encabezado is None:
+                    return vacias
+                posiciones = {nombre: posicion for posicion, nombre in enumerate(encabezado)}
+                ancho = len(encabezado)
+                # Las columnas ausentes en el archivo apuntan a una columna virtual vacía que
+                # se agrega al final de cada fila: sus valores numéricos se limpian a 0.0 y
+                # PROVINCIA queda como "DESCONOCIDA".
+                faltantes = [nombre for nombre in ("PROVINCIA", "MES", *self.CAMPOS_NUMERICOS_CLAVE) if nombre not in posiciones]
+                for nombre in faltantes:
+                    posiciones[nombre] = ancho
+                # Posiciones fijas calculadas una sola vez: itemgetter extrae los seis campos
+                # de cada fila en una única llamada, sin búsquedas por nombre.
+                extraer_campos = itemgetter(
+                    posiciones["PROVINCIA"],
+                    posiciones["MES"],
+                    posiciones["TOTAL_VENTAS"],
+                    posiciones["EXPORTACIONES"],
+                    posiciones["IMPORTACIONES"],
+                    posiciones["VENTAS_NETAS_TARIFA_0"],
+                )
                 
+                limpiar = self._limpiar_valor_numerico
+                cod_provincias = columnas["PROVINCIA"]
+                cod_meses = columnas["MES"]
+                nombres_provincia = etiquetas["PROVINCIA"]
+                nombres_mes = etiquetas["MES"]
+                ventas = columnas["TOTAL_VENTAS"]
+                exportaciones = columnas["EXPORTACIONES"]
+                importaciones = columnas["IMPORTACIONES"]
+                ventas_cero = columnas["VENTAS_NETAS_TARIFA_0"]
+                # PROVINCIA y MES se repiten en miles de filas: cada valor leído se traduce una
+                # sola vez a un código entero, así .upper() no se repite por fila y las sumas
+                # agrupan por posición en lugar de por hash de cadenas.
+                codigos_provincia = {}
+                codigos_mes = {}
+                indice_provincia = {}
+                indice_mes = {}
+                # Sin columna PROVINCIA todas las filas leen "" y se registran como "DESCONOCIDA"
+                # (al leer la primera fila, para no crear una provincia sin filas)
+                provincia_ausente = "PROVINCIA" in faltantes
+
                 for fila in lector:
+                    # Igual que DictReader: ignorar líneas vacías y completar filas incompletas
+                    # (los campos sobrantes de filas largas se descartan)
+                    if not fila:
+                        continue
+                    if len(fila) != ancho:
+                        del fila[ancho:]
+                        fila += [""] * (ancho - len(fila))
+                    if faltantes:
+                        fila.append("")
+
+                    provincia, mes, total_venta, exportacion, importacion, venta_cero = extraer_campos(fila)
+
                     # 1. Normalizar el campo PROVINCIA a mayúsculas para búsquedas consistentes
-                    fila["PROVINCIA"] = fila.get("PROVINCIA", "DESCONOCIDA").upper() 
-                    
+                    codigo = codigos_provincia.get(provincia)
+                    if codigo is None:
+                        nombre = "DESCONOCIDA" if provincia_ausente else provincia.upper()
+                        codigo = codigos_provincia[provincia] = self._codigo_etiqueta(nombres_provincia, indice_provincia, nombre)
+                    cod_provincias.append(codigo)
+
+                    codigo = codigos_mes.get(mes)
+                    if codigo is None:
+                        codigo = codigos_mes[mes] = self._codigo_etiqueta(nombres_mes, indice_mes, mes)
+                    cod_meses.append(codigo)
+
                     # 2. Aplicar limpieza y conversión a todos los campos numéricos clave
-                    for campo in self.CAMPOS_NUMERICOS_CLAVE:
-                        valor_limpio = self._limpiar_valor_numerico(fila.get(campo))
-                        fila[campo] = valor_limpio
-                    
-                    datos_limpios.append(fila)
+                    ventas.append(limpiar(total_venta))
+                    exportaciones.append(limpiar(exportacion))
+                    importaciones.append(limpiar(importacion))
+                    ventas_cero.append(limpiar(venta_cero))
                     
         except Exception as e:
             print(f"Error durante la lectura del archivo CSV: {e}")
-            return []
+            return self._columnas_vacias()
             
-        return datos_limpios
+        return columnas, etiquetas
 
-    # --- Funciones Base (Paso 2) ---
+    @cached_property
+    def _agg(self):
+        """Recorre las columnas una única vez y memoriza las sumas por provincia y por mes.
+
+        Al ser cached_property se calcula en el primer acceso y todas las consultas
+        posteriores reutilizan el resultado.
+        """
+        columnas = self.columnas
+        nombres_provincia = self.etiquetas["PROVINCIA"]
+        nombres_mes = self.etiquetas["MES"]
 
-    def ventas_totales_por_provincia(self):
-        """Devuelve un diccionario con el total de ventas por provincia."""
-        # Usamos defaultdict para un código más limpio y eficiente
-        totales = defaultdict(float)
+        # Sumas por código: cada fila suma en la posición de su provincia/mes,
+        # sin calcular el hash de ninguna cadena.
+        ventas = [0.0] * len(nombres_provincia)
+        importaciones = [0.0] * len(nombres_provincia)
+        ventas_cero = [0.0] * len(nombres_provincia)
+        exportaciones = [0.0] * len(nombres_mes)
 
-        for fila in self.datos:
-            provincia = fila["PROVINCIA"]
-            # El valor ya es float y limpio gracias a leer_csv()
-            total_venta = fila["TOTAL_VENTAS"] 
+        # Los valores ya son float y limpios gracias a leer_csv()
+        filas = zip(
+            columnas["PROVINCIA"],
+            columnas["TOTAL_VENTAS"],
+            columnas["IMPORTACIONES"],
+            columnas["VENTAS_NETAS_TARIFA_0"],
+        )
+        for codigo, total_venta, importacion, venta_cero in filas:
+            ventas[codigo] += total_venta
+            importaciones[codigo] += importacion
+            ventas_cero[codigo] += venta_cero
 
-            totales[provincia] += total_venta
+        for codigo, exportacion in zip(columnas["MES"], columnas["EXPORTACIONES"]):
+            exportaciones[codigo] += exportacion
 
-        return dict(totales)
+        # Las ventas conservan la provincia vacía (clave ''), como el cálculo original;
+        # el resto de agregados omiten las etiquetas vacías (provincia o mes sin valor)
+        ventas_prov = {prov: ventas[i] for i, prov in enumerate(nombres_provincia)}
+        imp_prov = {prov: importaciones[i] for i, prov in enumerate(nombres_provincia) if prov}
+        vta0_prov = {prov: ventas_cero[i] for i, prov in enumerate(nombres_provincia) if prov}
+        exp_mes = {mes: exportaciones[i] for i, mes in enumerate(nombres_mes) if mes}
+
+        return SimpleNamespace(
+            ventas_prov=ventas_prov,
+            imp_prov=imp_prov,
+            vta0_prov=vta0_prov,
+            exp_mes=exp_mes,
+        )
+
+    # --- Funciones Base (Paso 2) ---
+
+    def ventas_totales_por_provincia(self, copiar=True):
+        """Devuelve un diccionario con el total de ventas por provincia.
+
+        Con copiar=False devuelve una vista de solo lectura del agregado en cache,
+        sin copiarlo (útil cuando solo se va a recorrer el resultado).
+        """
+        totales = self._agg.ventas_prov
+        # Copia (o vista de solo lectura) para que el llamador no pueda alterar el cache
+        return dict(totales) if copiar else MappingProxyType(totales)
 
     def ventas_por_provincia(self, nombre):
         """Devuelve el total de ventas de una provincia específica. Retorna 0.0 si no existe."""
@@ -78,8 +222,8 @@ class Analizador:
         # Normalizar el nombre de la provincia para coincidir con los datos internos (MAYÚSCULAS)
         nombre_normalizado = nombre.upper() 
         
-        # Generar los totales (si no se tiene un cache)
-        totales = self.ventas_totales_por_provincia()
+        # Consultar directamente el agregado en cache (sin volver a recorrer los datos)
+        totales = self._agg.ventas_prov
 
         # Usar .get() para retornar 0.0 si la provincia no existe (cumple requisito de prueba)
         return totales.get(nombre_normalizado, 0.0)
@@ -87,62 +231,34 @@ class Analizador:
     # --- Funciones de Trabajo Autónomo (Extensión) ---
 
     # [cite_start]1. Exportaciones totales por mes [cite: 94]
-    def exportaciones_totales_por_mes(self):
-        """Suma las EXPORTACIONES agrupadas por MES."""
-        exportaciones_por_mes = defaultdict(float)
-        
-        for fila in self.datos:
-            mes = fila.get("MES")
-            exportaciones = fila.get("EXPORTACIONES", 0.0)
-            
-            if mes: 
-                exportaciones_por_mes[mes] += exportaciones
-                
-        return dict(exportaciones_por_mes)
+    def exportaciones_totales_por_mes(self, copiar=True):
+        """Suma las EXPORTACIONES agrupadas por MES (copiar=False: vista de solo lectura, sin copia)."""
+        exportaciones_por_mes = self._agg.exp_mes
+        return dict(exportaciones_por_mes) if copiar else MappingProxyType(exportaciones_por_mes)
 
     # [cite_start]3. Provincia con mayor volumen de importaciones [cite: 97]
     def provincia_con_mas_importaciones(self):
         """Identifica la provincia con el mayor total de IMPORTACIONES."""
-        importaciones_por_provincia = defaultdict(float)
-        
-        for fila in self.datos:
-            provincia = fila.get("PROVINCIA")
-            importaciones = fila.get("IMPORTACIONES", 0.0)
-            
-            if provincia:
-                importaciones_por_provincia[provincia] += importaciones
+        importaciones_por_provincia = self._agg.imp_prov
         
         if not importaciones_por_provincia:
             return None, 0.0 # Retorna None si no hay datos
             
-        # Encontrar la provincia con el máximo valor (MAX Key por su valor)
-        provincia_max = max(importaciones_por_provincia, key=importaciones_por_provincia.get)
-        total_max = importaciones_por_provincia[provincia_max]
+        # Encontrar la provincia con el máximo valor: una sola pasada sobre los pares
+        # (provincia, total), sin volver a consultar el diccionario por cada clave
+        provincia_max, total_max = max(importaciones_por_provincia.items(), key=itemgetter(1))
         
         return provincia_max, total_max
 
     # 2. Porcentaje de ventas con tarifa 0% (Opcional, si eliges esta en lugar de la 3)
     def porcentaje_ventas_tarifa_cero(self):
         """Calcula el porcentaje de ventas con tarifa 0% respecto al total por provincia."""
-        ventas_cero_por_provincia = defaultdict(float)
-        ventas_totales_por_provincia = defaultdict(float)
+        agg = self._agg
+        ventas_totales = agg.ventas_prov
         
-        for fila in self.datos:
-            provincia = fila.get("PROVINCIA")
-            vta_cero = fila.get("VENTAS_NETAS_TARIFA_0", 0.0)
-            vta_total = fila.get("TOTAL_VENTAS", 0.0)
-            
-            if provincia:
-                ventas_cero_por_provincia[provincia] += vta_cero
-                ventas_totales_por_provincia[provincia] += vta_total
-        
-        porcentajes = {}
-        for provincia, total_ventas in ventas_totales_por_provincia.items():
-            ventas_cero = ventas_cero_por_provincia[provincia]
-            if total_ventas > 0:
-                porcentaje = (ventas_cero / total_ventas) * 100
-                porcentajes[provincia] = porcentaje
-            else:
-                porcentajes[provincia] = 0.0 # 0% si no hay ventas totales
-                
-        return porcentajes
\ No newline at end of file
+        # Una sola pasada sobre los totales ya agregados (sin la provincia vacía);
+        # 0% si no hay ventas totales
+        return {
+            provincia: (ventas_cero / ventas_totales[provincia]) * 100 if ventas_totales[provincia] > 0 else 0.0
+            for provincia, ventas_cero in agg.vta0_prov.items()
+        }
@@ -90,6 +90,20 @@ class TestAnalizador(unittest.TestCase):
         azuay_ventas = self.analizador.ventas_por_provincia('AZUAY')
         self.assertAlmostEqual(azuay_ventas, 3000.00, 2, "El total de ventas para AZUAY es incorrecto.")
 
+    # 6. Verificar que las consultas repetidas usen el agregado en cache sin alterarlo.
+    def test_resultados_en_cache_no_se_alteran(self):
+        resumen = self.analizador.ventas_totales_por_provincia()
+        resumen['PICHINCHA'] = -1.0
+        
+        self.assertAlmostEqual(self.analizador.ventas_por_provincia('pichincha'), 1500.00, 2, "Modificar el resultado no debe alterar el cache.")
+        self.assertEqual(self.analizador.ventas_totales_por_provincia(), self.analizador.ventas_totales_por_provincia(), "Las consultas repetidas deben coincidir.")
+
+        # Sin copia: vista de solo lectura con los mismos valores
+        vista = self.analizador.ventas_totales_por_provincia(copiar=False)
+        self.assertEqual(dict(vista), self.analizador.ventas_totales_por_provincia(), "La vista sin copia debe tener los mismos valores.")
+        with self.assertRaises(TypeError):
+            vista['PICHINCHA'] = -1.0
+
     # -----------------------------------------------
     # PRUEBAS TRABAJO AUTÓNOMO
     # -----------------------------------------------
@@ -106,6 +120,24 @@ class TestAnalizador(unittest.TestCase):
         
         # Validar Mes 02: 1000.00 + 0.00 (el -10.00 se limpió a 0) = 1000.00
         self.assertAlmostEqual(resumen.get('02'), 1000.00, 2, "El total de exportaciones para el mes 02 es incorrecto.")
+
+    # Limpieza: valores con coma decimal, negativos y no numéricos.
+    def test_limpiar_valor_numerico_formatos(self):
+        limpiar = self.analizador._limpiar_valor_numerico
+        self.assertAlmostEqual(limpiar('1234.50'), 1234.50, 2, "El punto decimal debe interpretarse correctamente.")
+        self.assertAlmostEqual(limpiar('1234,50'), 1234.50, 2, "La coma decimal debe interpretarse correctamente.")
+        self.assertEqual(limpiar('-10,00'), 0.0, "Los valores negativos deben limpiarse a 0.0.")
+        self.assertEqual(limpiar('NO_NUM'), 0.0, "Los valores no numéricos deben limpiarse a 0.0.")
+        self.assertEqual(limpiar('0.0000'), 0.0, "Los ceros literales deben limpiarse a 0.0.")
+        self.assertEqual(limpiar(''), 0.0, "Los valores vacíos deben limpiarse a 0.0.")
+
+    # 2. Porcentaje de ventas con tarifa 0% (el MOCK no trae VENTAS_NETAS_TARIFA_0: se limpia a 0.0)
+    def test_porcentaje_ventas_tarifa_cero_sin_columna(self):
+        porcentajes = self.analizador.porcentaje_ventas_tarifa_cero()
+        
+        self.assertEqual(set(porcentajes), {'PICHINCHA', 'GUAYAS', 'AZUAY', 'IMBABURA'}, "Debe haber un porcentaje por provincia.")
+        for provincia, porcentaje in porcentajes.items():
+            self.assertEqual(porcentaje, 0.0, f"El porcentaje de {provincia} debe ser 0.0 sin ventas con tarifa 0%.")
 167420
     # 3. Provincia con mayor volumen de importaciones
 def test_provincia_con_mas_importaciones_identificacion(self):
@@ -118,5 +150,89 @@ def test_provincia_con_mas_importaciones_identificacion(self):
         self.assertAlmostEqual(total, 1300.00, 2, "El total de importaciones para la provincia máxima es incorrecto.")
         self.assertGreater(total, 0.0, "El valor de importaciones debe ser positivo.")
 
+# --- ARCHIVOS MOCK PARA CASOS BORDE ---
+# Cada archivo se escribe tal cual (texto crudo) para controlar filas vacías, cortas o largas.
+MOCK_ENCABEZADO = 'PROVINCIA|MES|TOTAL_VENTAS|EXPORTACIONES|IMPORTACIONES|VENTAS_NETAS_TARIFA_0\n'
+MOCK_CSV_BORDE = {
+    # Fila con PROVINCIA vacía: sus ventas se reportan bajo la clave ''
+    'mock_provincia_vacia.csv': MOCK_ENCABEZADO + '|01|10|1|1|1\nPICHINCHA|01|5|1|1|1\n',
+    # Ventas con tarifa 0%: PICHINCHA 500/2000 = 25% | GUAYAS sin ventas totales = 0% | AZUAY 400/400 = 100%
+    'mock_tarifa_cero.csv': MOCK_ENCABEZADO + (
+        'PICHINCHA|01|1000.00|0|0|250.00\n'
+        'PICHINCHA|02|1000.00|0|0|250.00\n'
+        'GUAYAS|01|0.00|0|0|50.00\n'
+        'AZUAY|01|400.00|0|0|400.00\n'
+    ),
+    # Filas irregulares: línea vacía (se ignora), fila corta (campos faltantes = 0.0)
+    # y fila larga (los campos sobrantes se descartan)
+    'mock_filas_irregulares.csv': MOCK_ENCABEZADO + (
+        'PICHINCHA|01|100.00|10.00|5.00|20.00\n'
+        '\n'
+        'GUAYAS|02|300.00\n'
+        'AZUAY|03|50.00|5.00|7.00|10.00|EXTRA|99.00\n'
+    ),
+    # Sin columnas PROVINCIA, EXPORTACIONES ni VENTAS_NETAS_TARIFA_0; el 99.00 sobrante
+    # de la fila larga no debe leerse como ninguna de las columnas ausentes
+    'mock_sin_provincia.csv': 'MES|TOTAL_VENTAS|IMPORTACIONES\n01|100.00|5.00|99.00\n02|50.00\n',
+    # Sin columna PROVINCIA y sin filas de datos: no debe aparecer ninguna provincia
+    'mock_sin_provincia_vacio.csv': 'MES|TOTAL_VENTAS\n',
+}
+
+class TestAnalizadorCasosBorde(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        for nombre, contenido in MOCK_CSV_BORDE.items():
+            with open(nombre, 'w', newline='', encoding='utf-8') as f:
+                f.write(contenido)
+
+    @classmethod
+    def tearDownClass(cls):
+        for nombre in MOCK_CSV_BORDE:
+            if os.path.exists(nombre):
+                os.remove(nombre)
+
+    # Las ventas de filas sin provincia se conservan bajo '' (solo en el total de ventas).
+    def test_provincia_vacia_se_conserva_en_ventas(self):
+        analizador = Analizador('mock_provincia_vacia.csv', separador=MOCK_SEPARATOR)
+        
+        self.assertEqual(analizador.ventas_totales_por_provincia(), {'': 10.0, 'PICHINCHA': 5.0}, "Las ventas sin provincia deben conservarse bajo ''.")
+        self.assertEqual(analizador.ventas_por_provincia(''), 10.0, "La consulta por provincia vacía debe retornar sus ventas.")
+        self.assertEqual(analizador.provincia_con_mas_importaciones(), ('PICHINCHA', 1.0), "La provincia vacía no cuenta para importaciones.")
+        self.assertEqual(set(analizador.porcentaje_ventas_tarifa_cero()), {'PICHINCHA'}, "La provincia vacía no cuenta para el porcentaje.")
+
+    # Porcentaje de ventas con tarifa 0% con valores distintos de cero.
+    def test_porcentaje_ventas_tarifa_cero_calculo_correcto(self):
+        analizador = Analizador('mock_tarifa_cero.csv', separador=MOCK_SEPARATOR)
+        porcentajes = analizador.porcentaje_ventas_tarifa_cero()
+        
+        self.assertAlmostEqual(porcentajes['PICHINCHA'], 25.00, 2, "El porcentaje de tarifa 0% para PICHINCHA es incorrecto.")
+        self.assertEqual(porcentajes['GUAYAS'], 0.0, "Sin ventas totales el porcentaje debe ser 0.0.")
+        self.assertAlmostEqual(porcentajes['AZUAY'], 100.00, 2, "El porcentaje de tarifa 0% para AZUAY es incorrecto.")
+
+    # Líneas vacías, filas cortas y filas largas se leen igual que con csv.DictReader.
+    def test_filas_irregulares(self):
+        analizador = Analizador('mock_filas_irregulares.csv', separador=MOCK_SEPARATOR)
+        
+        self.assertEqual(analizador.ventas_totales_por_provincia(), {'PICHINCHA': 100.0, 'GUAYAS': 300.0, 'AZUAY': 50.0}, "Las ventas con filas irregulares son incorrectas.")
+        self.assertEqual(analizador.exportaciones_totales_por_mes(), {'01': 10.0, '02': 0.0, '03': 5.0}, "Las exportaciones con filas irregulares son incorrectas.")
+        self.assertEqual(analizador.provincia_con_mas_importaciones(), ('AZUAY', 7.0), "La fila larga debe conservar sus campos conocidos.")
+        self.assertEqual(analizador.porcentaje_ventas_tarifa_cero(), {'PICHINCHA': 20.0, 'GUAYAS': 0.0, 'AZUAY': 20.0}, "Los porcentajes con filas irregulares son incorrectos.")
+
+    # Columnas ausentes: PROVINCIA queda como "DESCONOCIDA" y los campos numéricos como 0.0.
+    def test_columnas_ausentes(self):
+        analizador = Analizador('mock_sin_provincia.csv', separador=MOCK_SEPARATOR)
+        
+        self.assertEqual(analizador.ventas_totales_por_provincia(), {'DESCONOCIDA': 150.0}, "Sin columna PROVINCIA las ventas deben agruparse en DESCONOCIDA.")
+        self.assertEqual(analizador.exportaciones_totales_por_mes(), {'01': 0.0, '02': 0.0}, "Sin columna EXPORTACIONES los valores deben ser 0.0.")
+        self.assertEqual(analizador.provincia_con_mas_importaciones(), ('DESCONOCIDA', 5.0), "Las importaciones sin columna PROVINCIA son incorrectas.")
+        self.assertEqual(analizador.porcentaje_ventas_tarifa_cero(), {'DESCONOCIDA': 0.0}, "Sin columna VENTAS_NETAS_TARIFA_0 el porcentaje debe ser 0.0.")
+        
+        # Solo encabezado: "DESCONOCIDA" no debe registrarse si no hay filas
+        vacio = Analizador('mock_sin_provincia_vacio.csv', separador=MOCK_SEPARATOR)
+        self.assertEqual(vacio.ventas_totales_por_provincia(), {}, "Sin filas no debe haber provincias.")
+        self.assertEqual(vacio.provincia_con_mas_importaciones(), (None, 0.0), "Sin filas no debe haber provincia con importaciones.")
+        self.assertEqual(vacio.porcentaje_ventas_tarifa_cero(), {}, "Sin filas no debe haber porcentajes.")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file